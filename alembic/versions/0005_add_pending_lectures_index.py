@@ -0,0 +1,29 @@
+"""Add partial index over lectures whose audio isn't done.
+
+Revision ID: 0005
+Revises: ea5ce8cae5ce
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "ea5ce8cae5ce"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_lectures_pending",
+        "lectures",
+        ["course_id", "id"],
+        sqlite_where=sa.text("audio_status != 'done'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_lectures_pending", table_name="lectures", if_exists=True)
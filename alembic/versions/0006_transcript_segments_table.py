@@ -0,0 +1,64 @@
+"""Store transcript segments as rows instead of a JSON column.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Read the JSON out before touching the schema: batch_alter_table rebuilds
+    # transcripts, and with foreign_keys on, dropping the old table would
+    # cascade-delete any segment rows already pointing at it
+    conn = op.get_bind()
+    rows = [
+        {"transcript_id": transcript_id, "start": s["start"], "end": s["end"], "text": s["text"]}
+        for transcript_id, raw in conn.execute(sa.text("SELECT id, segments FROM transcripts ORDER BY id"))
+        for s in json.loads(raw or "[]")
+    ]
+
+    with op.batch_alter_table("transcripts", schema=None) as batch_op:
+        batch_op.drop_column("segments")
+
+    segments_table = op.create_table(
+        "transcript_segments",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("transcript_id", sa.Integer(), sa.ForeignKey("transcripts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("start", sa.Float(), nullable=False),
+        sa.Column("end", sa.Float(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+    )
+    op.create_index("idx_transcript_segments_transcript", "transcript_segments", ["transcript_id"])
+    if rows:
+        op.bulk_insert(segments_table, rows)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    grouped: dict[int, list[dict]] = {}
+    for transcript_id, start, end, text in conn.execute(sa.text(
+        'SELECT transcript_id, start, "end", text FROM transcript_segments ORDER BY id'
+    )):
+        grouped.setdefault(transcript_id, []).append({"start": start, "end": end, "text": text})
+
+    op.drop_index("idx_transcript_segments_transcript", table_name="transcript_segments")
+    op.drop_table("transcript_segments")
+
+    with op.batch_alter_table("transcripts", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("segments", sa.Text(), nullable=False, server_default="[]"))
+
+    for transcript_id, segments in grouped.items():
+        conn.execute(
+            sa.text("UPDATE transcripts SET segments = :segments WHERE id = :id"),
+            {"segments": json.dumps(segments), "id": transcript_id},
+        )
@@ -7,8 +7,9 @@ import sys
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
-from sqlalchemy import create_engine, event, inspect
+from sqlalchemy import create_engine, event, inspect, literal_column
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.models import Base
@@ -28,6 +29,11 @@ engine = create_engine(
 def _set_sqlite_pragma(dbapi_conn, connection_record):
     cursor = dbapi_conn.cursor()
     cursor.execute("PRAGMA foreign_keys = ON")
+    # WAL lets readers proceed during writes and turns each commit into an
+    # append; NORMAL sync is crash-safe under WAL and skips the per-commit fsync
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute("PRAGMA wal_autocheckpoint = 1000")
     cursor.close()
 
 
@@ -47,6 +53,53 @@ def get_db():
         session.close()
 
 
+def iter_pending_lectures(
+    course_id: int | None = None,
+    statuses: tuple[str, ...] = ("pending", "error"),
+) -> Iterator[tuple[int, int]]:
+    """Yield (lecture_id, course_id) for lectures still waiting on audio.
+
+    The literal ``audio_status != 'done'`` term mirrors the WHERE clause of the
+    partial ``idx_lectures_pending`` index, so SQLite only walks unfinished
+    lectures instead of scanning the whole table.
+    """
+    from app.models import Lecture
+    with get_db() as session:
+        q = session.query(Lecture.id, Lecture.course_id).filter(
+            Lecture.audio_status != literal_column("'done'"),
+            Lecture.audio_status.in_(statuses),
+        )
+        if course_id is not None:
+            q = q.filter(Lecture.course_id == course_id)
+        rows = q.order_by(Lecture.course_id, Lecture.id).all()
+    # Rows are materialised first so callers can write without a read txn open
+    for row in rows:
+        yield row.id, row.course_id
+
+
+def latest_transcript(session: Session, lecture_id: int):
+    """Return (transcript, segments) for the lecture's newest transcript, or None.
+
+    Segments are read as plain column tuples rather than ORM objects, in
+    insertion order, as [{"start", "end", "text"}] dicts.
+    """
+    from app.models import Transcript, TranscriptSegment
+    transcript = (
+        session.query(Transcript)
+        .filter(Transcript.lecture_id == lecture_id)
+        .order_by(Transcript.id.desc())
+        .first()
+    )
+    if transcript is None:
+        return None
+    rows = (
+        session.query(TranscriptSegment.start, TranscriptSegment.end, TranscriptSegment.text)
+        .filter(TranscriptSegment.transcript_id == transcript.id)
+        .order_by(TranscriptSegment.id)
+    )
+    return transcript, [{"start": r.start, "end": r.end, "text": r.text} for r in rows]
+
+
 def init_db() -> None:
     _alembic_dir = Path(__file__).resolve().parent.parent / "alembic"
     _alembic_ini = Path(__file__).resolve().parent.parent / "alembic.ini"
@@ -12,6 +12,7 @@ import httpx
 from app import async_downloader, jobs
 from app.database import get_db
 from app.models import Course, Lecture, Note
+from app.pipeline import _safe_filename, _safe_name
 from app.scraper import _COOKIES_FILE, _extract_stream_url
 
 _LOGGER = logging.getLogger(__name__)
@@ -61,21 +62,13 @@ def _cookie_header(cookies: dict[str, str]) -> str:
     return "; ".join(f"{k}={v}" for k, v in cookies.items())
 
 
-def _safe_course_dir(course_name: str) -> str:
-    return re.sub(r'[\\/:*?"<>|]', "_", course_name)
-
-
-def _safe_filename(date: str, title: str) -> str:
-    return re.sub(r'[\\/:*?"<>|]', "_", f"{date} - {title}")[:150]
-
-
 def _resolve_stream_url_chrome(video_json: dict, hostname: str) -> str | list[str] | None:
     """Use headless Chrome to load the classroom page and extract video URLs.
 
     Chrome executes JS that fetches signed/playable URLs — httpx only gets
     template URLs that return 403.  Runs synchronously (call from executor).
     """
-    from app.scraper import _build_driver, _load_session
+    from app.scraper import _pool
 
     url = _extract_stream_url(video_json, hostname)
     if url:
@@ -91,12 +84,7 @@ def _resolve_stream_url_chrome(video_json: dict, hostname: str) -> str | list[st
     # Get section_id from the lesson JSON for session warmup
     section_id = video_json.get("lesson", {}).get("lesson", {}).get("sectionId")
 
-    driver = None
-    try:
-        driver = _build_driver()
-        if not _load_session(driver, hostname):
-            raise RuntimeError("No valid session for Chrome")
-
+    with _pool.acquire(hostname) as driver:
         import time as _time
 
         # Visit section home first to establish session context
@@ -145,13 +133,6 @@ def _resolve_stream_url_chrome(video_json: dict, hostname: str) -> str | list[st
         _LOGGER.error("Chrome: no video URLs found after 3 attempts for %s", classroom_url)
         return None
 
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-
 
 async def _extract_frame_ffmpeg(
     input_path: str, offset: float, output_path: str, cookies: dict[str, str] | None = None, is_url: bool = False
@@ -217,11 +198,11 @@ async def extract_frames(lecture_id: int) -> None:
 
     try:
         # Set up output directory
-        course_dir = os.path.join(audio_dir, _safe_course_dir(course_name))
+        course_dir = os.path.join(audio_dir, _safe_name(course_name))
         frames_dir = os.path.join(course_dir, "frames")
         os.makedirs(frames_dir, exist_ok=True)
 
-        filename_base = _safe_filename(row["date"], row["title"])
+        filename_base = _safe_filename(row)
         target_times = [ft["time"] for ft in frame_timestamps]
 
         cookies = _build_cookies()
@@ -1,5 +1,6 @@
 """Background job queue and SSE broadcast."""
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -34,6 +35,10 @@ _syncing_courses: set[int] = set()
 
 # Thread pool for Selenium (the only truly blocking work left)
 _blocking_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="echo360-blocking")
+# Thread pool for transcriber file IO (see run_io), bounded so a burst of
+# transcriptions can't spawn a thread per pending read. Kept apart from the
+# loop's default executor, which DNS lookups for the HTTP clients go through.
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="echo360-io")
 
 
 def set_loop(loop: asyncio.AbstractEventLoop) -> None:
@@ -61,7 +66,7 @@ def broadcast(data: dict) -> None:
         elif data.get("type") in ("sync_done", "sync_error"):
             _syncing_courses.discard(cid)
 
-    if _loop is None:
+    if _loop is None or not _listeners:
         return
     msg = json.dumps(data)
     with _lock:
@@ -70,6 +75,12 @@ def broadcast(data: dict) -> None:
         _loop.call_soon_threadsafe(q.put_nowait, msg)
 
 
+def has_subscribers() -> bool:
+    """True while at least one SSE client is connected. Progress reporters
+    check this to skip building payloads nobody will receive."""
+    return bool(_listeners)
+
+
 def is_syncing(course_id: int) -> bool:
     return course_id in _syncing_courses
 
@@ -299,8 +310,14 @@ def submit(fn, *args, **kwargs):
     return _blocking_executor.submit(fn, *args, **kwargs)
 
 
+def run_io(fn, *args, **kwargs) -> asyncio.Future:
+    """Run blocking file IO on the bounded IO pool; await the result."""
+    return asyncio.get_running_loop().run_in_executor(_io_executor, functools.partial(fn, *args, **kwargs))
+
+
 def shutdown() -> None:
     for task in _tasks:
         task.cancel()
     _tasks.clear()
     _blocking_executor.shutdown(wait=False, cancel_futures=True)
+    _io_executor.shutdown(wait=False, cancel_futures=True)
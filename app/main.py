@@ -2,7 +2,6 @@ import asyncio
 import json
 import logging
 import os
-import re
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -17,9 +16,10 @@ from sqlalchemy import case, func
 from sqlalchemy.exc import IntegrityError
 from sse_starlette.sse import EventSourceResponse
 
-from app.database import get_db, init_db
-from app.models import Course, Lecture, Note, Transcript
-from app import jobs, scraper
+from app.database import get_db, init_db, iter_pending_lectures, latest_transcript
+from app.models import Course, Lecture, Note
+from app import jobs, scraper, transcriber
+from app.pipeline import _safe_filename, _safe_name
 
 STATIC_DIR = Path(__file__).parent / "static"
 AUDIO_DIR = os.environ.get("ECHO360_AUDIO_DIR", os.path.expanduser("~/echo360-library"))
@@ -36,6 +36,8 @@ async def lifespan(app: FastAPI):
     _cleanup_raw_files()
     yield
     jobs.shutdown()
+    scraper.shutdown()
+    await transcriber.shutdown()
 
 
 def _recover_downloaded():
@@ -51,9 +53,9 @@ def _recover_downloaded():
     for lid, raw_path, date, title, course_name in rows:
         if raw_path and os.path.exists(raw_path):
             course_dir = os.path.join(
-                AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name)
+                AUDIO_DIR, _safe_name(course_name)
             )
-            filename = re.sub(r'[\\/:*?"<>|]', "_", f"{date} - {title}")[:150]
+            filename = _safe_filename({"date": date, "title": title})
             jobs.enqueue_convert(lid, raw_path, course_dir, filename)
 
 
@@ -312,7 +314,7 @@ def download_lecture(lecture_id: int):
     jobs.broadcast({"type": "lecture_update", "lecture_id": lecture_id, "course_id": row["course_id"], "status": "queued"})
 
     course_dir = os.path.join(
-        AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name)
+        AUDIO_DIR, _safe_name(course_name)
     )
     jobs.enqueue_download(lecture_id, course_dir)
     return {"status": "queued"}
@@ -325,14 +327,8 @@ def download_all(course_id: int):
         if not course:
             raise HTTPException(404, "Course not found")
         course_name = course.name
-        lectures = (
-            session.query(Lecture)
-            .filter(Lecture.course_id == course_id, Lecture.audio_status.in_(("pending", "error")))
-            .all()
-        )
-        lecture_data = [lec.to_dict() for lec in lectures]
 
-    lecture_ids = [lec["id"] for lec in lecture_data]
+    lecture_ids = [lid for lid, _ in iter_pending_lectures(course_id)]
     if lecture_ids:
         with get_db() as session:
             session.query(Lecture).filter(Lecture.id.in_(lecture_ids)).update(
@@ -342,11 +338,11 @@ def download_all(course_id: int):
             jobs.broadcast({"type": "lecture_update", "lecture_id": lid, "course_id": course_id, "status": "queued"})
 
     course_dir = os.path.join(
-        AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name)
+        AUDIO_DIR, _safe_name(course_name)
     )
-    for lec in lecture_data:
-        jobs.enqueue_download(lec["id"], course_dir)
-    return {"queued": len(lecture_data)}
+    for lid in lecture_ids:
+        jobs.enqueue_download(lid, course_dir)
+    return {"queued": len(lecture_ids)}
 
 
 # ── Re-download ───────────────────────────────────────────────────────────────
@@ -371,7 +367,7 @@ def redownload_lecture(lecture_id: int):
 
     jobs.broadcast({"type": "lecture_update", "lecture_id": lecture_id, "course_id": course_id, "status": "queued"})
     course_dir = os.path.join(
-        AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name)
+        AUDIO_DIR, _safe_name(course_name)
     )
     jobs.enqueue_download(lecture_id, course_dir)
     return {"status": "queued"}
@@ -401,7 +397,7 @@ def bulk_redownload(req: BulkIdsRequest):
     for lid, cid, course_name in rows:
         jobs.broadcast({"type": "lecture_update", "lecture_id": lid, "course_id": cid, "status": "queued"})
         course_dir = os.path.join(
-            AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name)
+            AUDIO_DIR, _safe_name(course_name)
         )
         jobs.enqueue_download(lid, course_dir)
     return {"queued": len(rows)}
@@ -424,7 +420,7 @@ def bulk_download(req: BulkIdsRequest):
     for lid, cid, course_name in rows:
         jobs.broadcast({"type": "lecture_update", "lecture_id": lid, "course_id": cid, "status": "queued"})
         course_dir = os.path.join(
-            AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name)
+            AUDIO_DIR, _safe_name(course_name)
         )
         jobs.enqueue_download(lid, course_dir)
     return {"queued": len(rows)}
@@ -505,17 +501,13 @@ def transcribe_lecture(lecture_id: int, req: TranscribeRequest | None = None):
 @app.get("/api/lectures/{lecture_id}/transcript")
 def get_transcript(lecture_id: int):
     with get_db() as session:
-        transcript = (
-            session.query(Transcript)
-            .filter(Transcript.lecture_id == lecture_id)
-            .order_by(Transcript.id.desc())
-            .first()
-        )
-    if not transcript:
+        found = latest_transcript(session, lecture_id)
+    if not found:
         raise HTTPException(404, "Transcript not found")
+    transcript, segments = found
     return {
         "model": transcript.model,
-        "segments": json.loads(transcript.segments),
+        "segments": segments,
         "created_at": transcript.created_at,
     }
 
@@ -652,9 +644,9 @@ def get_frames(lecture_id: int):
     if not frame_timestamps:
         return []
 
-    course_dir = os.path.join(AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name))
+    course_dir = os.path.join(AUDIO_DIR, _safe_name(course_name))
     frames_dir = os.path.join(course_dir, "frames")
-    filename_base = re.sub(r'[\\/:*?"<>|]', "_", f"{row['date']} - {row['title']}")[:150]
+    filename_base = _safe_filename(row)
 
     frames = []
     for ft in frame_timestamps:
@@ -679,9 +671,9 @@ def get_frame_image(lecture_id: int, timestamp: int):
         course_name = lec.course.name
         row = lec.to_dict()
 
-    course_dir = os.path.join(AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name))
+    course_dir = os.path.join(AUDIO_DIR, _safe_name(course_name))
     frames_dir = os.path.join(course_dir, "frames")
-    filename_base = re.sub(r'[\\/:*?"<>|]', "_", f"{row['date']} - {row['title']}")[:150]
+    filename_base = _safe_filename(row)
     frame_path = os.path.join(frames_dir, f"{filename_base}_{timestamp}s.jpg")
 
     if not os.path.exists(frame_path):
@@ -723,37 +715,31 @@ def transcribe_all_global(req: TranscribeRequest | None = None):
 @app.post("/api/download-all")
 def download_all_global():
     """Queue downloads for all pending/error lectures across every course."""
-    with get_db() as session:
-        lectures = (
-            session.query(Lecture.id, Lecture.course_id, Course.name.label("course_name"))
-            .join(Course, Lecture.course_id == Course.id)
-            .filter(Lecture.audio_status.in_(("pending", "error")))
-            .all()
-        )
-
+    lectures = list(iter_pending_lectures())
     if not lectures:
         return {"queued": 0}
 
-    lecture_ids = [lec.id for lec in lectures]
+    lecture_ids = [lid for lid, _ in lectures]
     with get_db() as session:
+        course_names = dict(session.query(Course.id, Course.name).all())
         session.query(Lecture).filter(Lecture.id.in_(lecture_ids)).update(
             {"audio_status": "queued"}, synchronize_session=False
         )
-    for lec in lectures:
-        jobs.broadcast({"type": "lecture_update", "lecture_id": lec.id, "course_id": lec.course_id, "status": "queued"})
+    for lid, cid in lectures:
+        jobs.broadcast({"type": "lecture_update", "lecture_id": lid, "course_id": cid, "status": "queued"})
 
-    for lec in lectures:
+    for lid, cid in lectures:
         course_dir = os.path.join(
-            AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", lec.course_name)
+            AUDIO_DIR, _safe_name(course_names[cid])
         )
-        jobs.enqueue_download(lec.id, course_dir)
+        jobs.enqueue_download(lid, course_dir)
     return {"queued": len(lectures)}
 
 
 # ── Pipeline ──────────────────────────────────────────────────────────────────
 
 def _course_dir_for(course_name: str) -> str:
-    return os.path.join(AUDIO_DIR, re.sub(r'[\\/:*?"<>|]', "_", course_name))
+    return os.path.join(AUDIO_DIR, _safe_name(course_name))
 
 
 def _enqueue_lecture_pipeline(lecture_id: int, course_name: str, req: PipelineRequest) -> bool:
@@ -5,11 +5,13 @@ from sqlalchemy import (
     Column,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     event,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -35,7 +37,11 @@ class Course(Base):
 
 class Lecture(Base):
     __tablename__ = "lectures"
-    __table_args__ = (UniqueConstraint("course_id", "echo_id"),)
+    __table_args__ = (
+        UniqueConstraint("course_id", "echo_id"),
+        # Partial index so the download scheduler only touches unfinished lectures
+        Index("idx_lectures_pending", "course_id", "id", sqlite_where=text("audio_status != 'done'")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
@@ -65,10 +71,26 @@ class Transcript(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     lecture_id = Column(Integer, ForeignKey("lectures.id", ondelete="CASCADE"), nullable=False)
     model = Column(String, nullable=False)
-    segments = Column(Text, nullable=False)
     created_at = Column(String, nullable=False, default=lambda: datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
 
     lecture = relationship("Lecture", back_populates="transcripts")
+    segments = relationship(
+        "TranscriptSegment",
+        order_by="TranscriptSegment.id",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+    __table_args__ = (Index("idx_transcript_segments_transcript", "transcript_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id", ondelete="CASCADE"), nullable=False)
+    start = Column(Float, nullable=False)
+    end = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
 
 
 class Note(Base):
@@ -5,9 +5,9 @@ import os
 
 import litellm
 
-from app.database import get_db
+from app.database import get_db, latest_transcript
 from app.llm import router
-from app.models import Course, Lecture, Note, Transcript
+from app.models import Course, Lecture, Note
 from app import jobs
 
 _LOGGER = logging.getLogger(__name__)
@@ -200,15 +200,10 @@ async def generate_notes(lecture_id: int, model: str) -> None:
         course_name = (course.display_name or course.name) if course else "Unknown"
 
         # Get latest transcript
-        transcript = (
-            session.query(Transcript)
-            .filter(Transcript.lecture_id == lecture_id)
-            .order_by(Transcript.id.desc())
-            .first()
-        )
-        if not transcript:
+        found = latest_transcript(session, lecture_id)
+        if not found:
             return
-        segments = json.loads(transcript.segments)
+        _, segments = found
         lecture_title = lec.title
 
     try:
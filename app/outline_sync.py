@@ -1,5 +1,4 @@
 """Sync lecture transcripts and notes to Outline wiki."""
-import json
 import logging
 
 from app.outline import (
@@ -11,8 +10,8 @@ from app.outline import (
     create_document,
     update_document,
 )
-from app.database import get_db
-from app.models import Course, Lecture, Note, Transcript
+from app.database import get_db, latest_transcript
+from app.models import Course, Lecture, Note
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -156,14 +155,9 @@ def _sync(lecture_id: int) -> None:
         transcript_model = None
         transcript_date = None
         if has_transcript:
-            transcript = (
-                session.query(Transcript)
-                .filter(Transcript.lecture_id == lecture_id)
-                .order_by(Transcript.id.desc())
-                .first()
-            )
-            if transcript:
-                transcript_segments = json.loads(transcript.segments)
+            found = latest_transcript(session, lecture_id)
+            if found:
+                transcript, transcript_segments = found
                 transcript_model = transcript.model
                 transcript_date = transcript.created_at
 
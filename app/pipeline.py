@@ -3,15 +3,16 @@ import asyncio
 import json
 import logging
 import os
-import re
 import time
 
 import httpx
+import orjson
+from sqlalchemy import update
 
 from app.database import get_db
 from app.models import Lecture
 from app import async_downloader, jobs
-from app.scraper import _build_driver, _extract_stream_url, _load_session
+from app.scraper import _extract_stream_url, _pool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +20,9 @@ _LOGGER = logging.getLogger(__name__)
 _last_broadcast: dict[int, float] = {}
 _BROADCAST_INTERVAL = 0.5  # seconds
 
+# Characters not allowed in filenames on Windows, mapped to "_"
+_FILENAME_SAFE = str.maketrans({c: "_" for c in '\\/:*?"<>|'})
+
 
 def _throttled_progress(lecture_id: int, data: dict, _bcast) -> None:
     """Broadcast progress at most every _BROADCAST_INTERVAL seconds per lecture."""
@@ -30,17 +34,20 @@ def _throttled_progress(lecture_id: int, data: dict, _bcast) -> None:
     _bcast(data)
 
 
+def _safe_name(name: str) -> str:
+    return name.translate(_FILENAME_SAFE)
+
+
 def _safe_filename(row) -> str:
-    return re.sub(r'[\\/:*?"<>|]', "_", f"{row['date']} - {row['title']}")[:150]
+    return _safe_name(f"{row['date']} - {row['title']}")[:150]
 
 
 def _set_status(lecture_id: int, status: str, **extra):
+    # A single UPDATE — no SELECT to load the row first
     with get_db() as session:
-        lec = session.get(Lecture, lecture_id)
-        if lec:
-            lec.audio_status = status
-            for k, v in extra.items():
-                setattr(lec, k, v)
+        session.execute(
+            update(Lecture).where(Lecture.id == lecture_id).values(audio_status=status, **extra)
+        )
 
 
 async def run_download(lecture_id: int, output_dir: str) -> None:
@@ -70,7 +77,7 @@ async def run_download(lecture_id: int, output_dir: str) -> None:
     os.makedirs(output_dir, exist_ok=True)
     filename = _safe_filename(row)
 
-    video_json = json.loads(row["raw_json"])
+    video_json = orjson.loads(row["raw_json"])
     stream_url = _extract_stream_url(video_json, row["hostname"])
 
     # Early exit if lecture has no media at all
@@ -117,11 +124,10 @@ async def run_download(lecture_id: int, output_dir: str) -> None:
             _bcast({"status": "error", "error": "Download failed — no file produced"})
         return
 
-    # Save raw path and transition to downloaded
-    _set_status(lecture_id, "downloaded", raw_path=raw_path)
-    _bcast({"status": "downloaded"})
-
-    # Run conversion inline (async subprocess, no thread needed)
+    # Run conversion inline (async subprocess, no thread needed). run_convert
+    # records raw_path together with the "converting" status, so there is no
+    # separate "downloaded" write; startup recovery maps "converting" + raw_path
+    # back to "downloaded" either way.
     await run_convert(lecture_id, raw_path, output_dir, filename)
 
 
@@ -143,6 +149,8 @@ async def _download_fast(stream_url, output_dir: str, filename: str, lecture_id:
         dl_start = time.monotonic()
 
         def on_progress(done, total):
+            if not jobs.has_subscribers():
+                return
             elapsed = time.monotonic() - dl_start
             speed_bps = int(done / elapsed) if elapsed > 0 else 0
             remaining = total - done
@@ -169,20 +177,16 @@ def _download_chrome_fallback(row, output_dir: str, filename: str) -> str | None
     from echo360.videos import EchoCloudVideo
     from echo360.hls_downloader import Downloader
 
-    video_json = json.loads(row["raw_json"])
-    driver = None
+    video_json = orjson.loads(row["raw_json"])
     try:
-        driver = _build_driver()
-        if not _load_session(driver, row["hostname"]):
-            raise RuntimeError("No valid session. Please re-authenticate via the CLI.")
-
-        video = EchoCloudVideo(video_json, driver, row["hostname"], alternative_feeds=False)
-        # EchoCloudVideo sets _url to False when no streams are found
-        if not video.url:
-            _LOGGER.warning("Chrome fallback: no stream URL found for lecture (video.url=%r)", video.url)
-            return None
-        # Use the existing download which produces a raw .ts file (we skip conversion here)
-        result = video.download(output_dir, filename, audio_only=True)
+        with _pool.acquire(row["hostname"]) as driver:
+            video = EchoCloudVideo(video_json, driver, row["hostname"], alternative_feeds=False)
+            # EchoCloudVideo sets _url to False when no streams are found
+            if not video.url:
+                _LOGGER.warning("Chrome fallback: no stream URL found for lecture (video.url=%r)", video.url)
+                return None
+            # Use the existing download which produces a raw .ts file (we skip conversion here)
+            result = video.download(output_dir, filename, audio_only=True)
         if result:
             # Find the raw or opus file produced
             opus_path = os.path.join(output_dir, filename + ".opus")
@@ -199,12 +203,6 @@ def _download_chrome_fallback(row, output_dir: str, filename: str) -> str | None
     except Exception:
         _LOGGER.exception("Chrome fallback unexpected error for lecture")
         return None
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
 
 
 async def _probe_audio_codec(input_file: str) -> str | None:
@@ -239,7 +237,9 @@ async def _convert_to_opus(
     if codec == "opus":
         audio_opts = ["-vn", "-c:a", "copy"]
     else:
-        audio_opts = ["-vn", "-c:a", "libopus", "-b:a", "48k", "-threads", "0"]
+        # Mono: lecture audio is a single voice and Whisper downmixes anyway,
+        # so every later decode for transcription handles half the samples
+        audio_opts = ["-vn", "-ac", "1", "-c:a", "libopus", "-b:a", "48k", "-threads", "0"]
 
     use_progress = duration_seconds is not None and duration_seconds > 0 and on_progress is not None
 
@@ -294,10 +294,18 @@ async def run_convert(lecture_id: int, raw_path: str, output_dir: str, filename:
     def _bcast(data: dict):
         jobs.broadcast({"type": "lecture_update", "lecture_id": lecture_id, "course_id": course_id, **data})
 
-    _set_status(lecture_id, "converting")
+    # If Chrome fallback already produced an opus file, just use it
+    if raw_path.endswith(".opus"):
+        _set_status(lecture_id, "done", audio_path=raw_path, raw_path=None)
+        _bcast({"status": "done", "audio_path": raw_path})
+        return
+
+    _set_status(lecture_id, "converting", raw_path=raw_path)
     _bcast({"status": "converting"})
 
     def _on_convert_progress(done_secs, total_secs):
+        if not jobs.has_subscribers():
+            return
         _throttled_progress(lecture_id, {
             "status": "converting",
             "progress": {
@@ -310,12 +318,6 @@ async def run_convert(lecture_id: int, raw_path: str, output_dir: str, filename:
     try:
         opus_path = os.path.join(output_dir, filename + ".opus")
 
-        # If Chrome fallback already produced an opus file, just use it
-        if raw_path.endswith(".opus"):
-            _set_status(lecture_id, "done", audio_path=raw_path, raw_path=None)
-            _bcast({"status": "done", "audio_path": raw_path})
-            return
-
         if await _convert_to_opus(raw_path, opus_path, duration_seconds, _on_convert_progress):
             try:
                 os.remove(raw_path)
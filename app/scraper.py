@@ -1,17 +1,54 @@
 """Wraps the existing echo360 package for use by the web application.
 All public functions are designed to run in worker threads, not async coroutines.
 """
+import itertools
 import json
 import logging
 import os
 import re
+import threading
 import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+from urllib.parse import urlparse
+
+import orjson
 
 _LOGGER = logging.getLogger(__name__)
 
 _PROJ_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _COOKIES_FILE = os.path.join(_PROJ_ROOT, "_browser_persistent_session", "cookies.json")
 
+_HOSTNAME_RE = re.compile(r"https?://[^/]+")
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+
+# Runs in the page: deduped section UUIDs from course links, so only the IDs
+# cross the WebDriver pipe rather than the whole serialised DOM
+_SECTION_IDS_JS = (
+    "const re = /\\/section\\/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/i;"
+    "const ids = new Set();"
+    "document.querySelectorAll(\"a[href*='/section/']\").forEach(a => {"
+    "  const m = a.href.match(re); if (m) ids.add(m[1]);"
+    "});"
+    "return [...ids];"
+)
+
+# Static assets blocked in Chrome on the discovery/sync paths, which only need
+# the DOM and XHR JSON. Set ECHO360_BLOCK_ASSETS=0 to load pages in full.
+_BLOCK_ASSETS = os.environ.get("ECHO360_BLOCK_ASSETS", "1") != "0"
+_BLOCKED_ASSET_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp",
+    "*.woff", "*.woff2", "*.ttf",
+    "*.mp4", "*.m3u8", "*.ts",
+]
+
+# Lecture rows per executemany in sync_course
+_UPSERT_BATCH = 500
+
+# One pooled requests.Session per worker thread, rebuilt when cookies.json changes
+_SESSION_TLS = threading.local()
+
 
 # ── Driver helpers ────────────────────────────────────────────────────────────
 
@@ -44,13 +81,161 @@ def _build_driver():
     return webdriver.Chrome(service=Service(**service_kwargs), options=opts)
 
 
+_NO_SESSION_MSG = (
+    "No saved session found. Run the CLI first to log in:\n"
+    "  python echo360.py URL --chrome --persistent-session"
+)
+_SESSION_EXPIRED_MSG = "Session expired — please re-authenticate via the CLI."
+
+
+def _quit_driver(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _cookies_mtime() -> float | None:
+    try:
+        return os.path.getmtime(_COOKIES_FILE)
+    except OSError:
+        return None
+
+
+class _DriverPool:
+    """Keeps authenticated headless Chrome instances alive between scraper jobs.
+
+    Chrome startup plus cookie warm-up costs several seconds, so drivers are
+    handed out one caller at a time and parked afterwards, keyed by the
+    hostname their session was loaded for. A driver whose job raised (including
+    "session expired") is quit instead of parked, and parked drivers are
+    dropped once cookies.json changes.
+    """
+
+    def __init__(self, max_idle: int = 2):
+        self._max_idle = max_idle
+        self._idle: list[tuple[str, float | None, object]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, hostname: str, block_assets: bool = False):
+        """Yield a logged-in driver for hostname.
+
+        block_assets drops images, fonts and media for pages that only need
+        metadata. The filter is set on every acquire, since a parked driver may
+        next serve a download that needs the media requests.
+        """
+        driver = self._take(hostname)
+        if driver is None:
+            driver = _build_driver()
+            try:
+                if not _load_session(driver, hostname):
+                    raise RuntimeError(_NO_SESSION_MSG)
+            except BaseException:
+                _quit_driver(driver)
+                raise
+        _set_blocked_urls(driver, _BLOCKED_ASSET_URLS if block_assets and _BLOCK_ASSETS else [])
+        try:
+            yield driver
+        except BaseException:
+            _quit_driver(driver)
+            raise
+        self._release(hostname, driver)
+
+    def _take(self, hostname: str):
+        mtime = _cookies_mtime()
+        with self._lock:
+            for i, (host, cookies_mtime, driver) in enumerate(self._idle):
+                if host == hostname and cookies_mtime == mtime:
+                    del self._idle[i]
+                    break
+            else:
+                return None
+        try:
+            driver.current_url  # cheap liveness probe — Chrome may have crashed
+        except Exception:
+            _quit_driver(driver)
+            return None
+        return driver
+
+    def _release(self, hostname: str, driver) -> None:
+        # Leave the last page (possibly a playing lecture) so an idle Chrome
+        # stops fetching media and running page scripts
+        try:
+            driver.get("about:blank")
+        except Exception:
+            _quit_driver(driver)
+            return
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append((hostname, _cookies_mtime(), driver))
+                return
+        _quit_driver(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, _, driver in idle:
+            _quit_driver(driver)
+
+
+def _set_blocked_urls(driver, urls: list[str]) -> None:
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+    except Exception:
+        _LOGGER.debug("CDP URL blocking unavailable", exc_info=True)
+
+
+_pool = _DriverPool()
+
+
+def shutdown() -> None:
+    """Quit any parked Chrome instances. Called from the app lifespan."""
+    _pool.close()
+
+
 def _load_session(driver, hostname: str) -> bool:
-    """Restore saved cookies and warm up the Echo360 session."""
+    """Restore saved cookies into a fresh driver before its first navigation.
+
+    Cookies go in through CDP, which needs no loaded document, so the caller's
+    next driver.get() is the only page load. Browsers without CDP fall back to
+    loading the site, adding cookies one by one and refreshing.
+    """
     if not os.path.exists(_COOKIES_FILE):
         return False
+    cookies = _load_cookies_for(hostname)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setCookies", {"cookies": [_to_cdp_cookie(c, hostname) for c in cookies]}
+        )
+    except Exception:
+        _LOGGER.debug("CDP cookie injection unavailable, using add_cookie", exc_info=True)
+        return _load_session_legacy(driver, hostname, cookies)
+
+    if _has_jwt_cookie(driver, hostname):
+        return True
+    time.sleep(0.2)
+    return _has_jwt_cookie(driver, hostname)
+
+
+def _load_cookies_for(hostname: str) -> list[dict]:
+    """Saved cookies that apply to hostname; cookies without a domain are kept."""
+    host = urlparse(hostname).hostname or ""
+    with open(_COOKIES_FILE, "rb") as f:
+        cookies = orjson.loads(f.read())
+    matching = []
+    for c in cookies:
+        domain = (c.get("domain") or "").lstrip(".")
+        if domain and not (host == domain or host.endswith("." + domain)):
+            continue
+        matching.append(c)
+    return matching
+
+
+def _load_session_legacy(driver, hostname: str, cookies: list[dict]) -> bool:
     driver.get(hostname)
-    with open(_COOKIES_FILE) as f:
-        cookies = json.load(f)
     for cookie in cookies:
         cookie.pop("sameSite", None)
         try:
@@ -58,19 +243,48 @@ def _load_session(driver, hostname: str) -> bool:
         except Exception:
             pass
     driver.refresh()
-    time.sleep(2)
-    return any("ECHO_JWT" in c["name"] for c in driver.get_cookies())
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        WebDriverWait(driver, 10).until(lambda d: d.get_cookie("ECHO_JWT") is not None)
+    except TimeoutException:
+        return False
+    return True
+
+
+def _to_cdp_cookie(cookie: dict, hostname: str) -> dict:
+    """Convert a WebDriver cookie dict into a CDP Network.CookieParam."""
+    param = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if cookie.get("domain"):
+        param["domain"] = cookie["domain"]
+    else:
+        param["url"] = hostname
+    if cookie.get("expiry"):
+        param["expires"] = cookie["expiry"]
+    return param
 
 
+def _has_jwt_cookie(driver, hostname: str) -> bool:
+    jar = driver.execute_cdp_cmd("Network.getCookies", {"urls": [hostname]})
+    return any(c["name"] == "ECHO_JWT" for c in jar.get("cookies", []))
+
+
+@lru_cache(maxsize=256)
 def _extract_hostname(url: str) -> str:
-    m = re.search(r"https?://[^/]+", url)
+    m = _HOSTNAME_RE.search(url)
     return m.group() if m else url
 
 
+@lru_cache(maxsize=256)
 def _extract_section_id(url: str) -> str:
-    m = re.search(
-        r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", url, re.I
-    )
+    m = _UUID_RE.search(url)
     return m.group() if m else ""
 
 
@@ -78,54 +292,51 @@ def _extract_section_id(url: str) -> str:
 
 def discover_course_urls(courses_page_url: str) -> list[str]:
     """Navigate to the Echo360 /courses listing page and return all section URLs."""
+    from selenium.common.exceptions import TimeoutException
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
 
-    hostname = _extract_hostname(courses_page_url)
-    driver = None
-    try:
-        driver = _build_driver()
-        if not _load_session(driver, hostname):
-            raise RuntimeError(
-                "No saved session found. Run the CLI first to log in:\n"
-                "  python echo360.py URL --chrome --persistent-session"
-            )
+    section_link = (By.CSS_SELECTOR, "a[href*='/section/']")
+    courses_nav = (By.XPATH, "//a[normalize-space()='Courses'] | //span[normalize-space()='Courses']/parent::a")
 
+    hostname = _extract_hostname(courses_page_url)
+    with _pool.acquire(hostname, block_assets=True) as driver:
         driver.get(courses_page_url)
 
-        # Wait for initial JS render
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-        )
-        time.sleep(2)
+        # Wait for the document to finish loading, then for the SPA to render
+        # either course links or its nav bar
+        try:
+            WebDriverWait(driver, 30).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            WebDriverWait(driver, 15).until(EC.any_of(
+                EC.presence_of_element_located(section_link),
+                EC.presence_of_element_located(courses_nav),
+            ))
+        except TimeoutException:
+            pass
 
         # Echo360 may land on Library — click the Courses nav link if visible
         try:
-            courses_link = driver.find_element(By.XPATH, "//a[normalize-space()='Courses'] | //span[normalize-space()='Courses']/parent::a")
-            if courses_link:
-                courses_link.click()
-                time.sleep(3)
+            driver.find_element(*courses_nav).click()
+            WebDriverWait(driver, 8).until(EC.presence_of_element_located(section_link))
         except Exception:
             pass
 
-        uuid_pattern = re.compile(
-            r"/section/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})",
-            re.I,
-        )
-
-        # Poll for up to 20s — the SPA loads course data via XHR after initial render
-        page_source = ""
+        # Poll for up to 20s — the SPA loads course data via XHR after initial render.
+        # The last poll's matches are the result.
+        section_ids: list[str] = []
         for _ in range(10):
-            time.sleep(2)
-            page_source = driver.page_source
-            if uuid_pattern.search(page_source):
+            section_ids = driver.execute_script(_SECTION_IDS_JS) or []
+            if section_ids:
                 break
             # Scroll down to trigger any lazy-loaded content
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+            time.sleep(2)
 
         current_url = driver.current_url
-        _LOGGER.info("discover_course_urls: landed on %s, page length %d", current_url, len(page_source))
+        _LOGGER.info("discover_course_urls: landed on %s, %d section links", current_url, len(section_ids))
 
         # Save a screenshot for debugging
         try:
@@ -136,14 +347,9 @@ def discover_course_urls(courses_page_url: str) -> list[str]:
             pass
 
         if "/login" in current_url or "sign-in" in current_url.lower():
-            raise RuntimeError("Session expired — please re-authenticate via the CLI.")
+            raise RuntimeError(_SESSION_EXPIRED_MSG)
 
-        seen: set[str] = set()
-        urls: list[str] = []
-        for m in uuid_pattern.finditer(page_source):
-            if m.group(1) not in seen:
-                seen.add(m.group(1))
-                urls.append(f"{hostname}/section/{m.group(1)}/home")
+        urls = [f"{hostname}/section/{sid}/home" for sid in section_ids]
 
         _LOGGER.info("discover_course_urls: extracted %d unique section URLs", len(urls))
 
@@ -154,12 +360,6 @@ def discover_course_urls(courses_page_url: str) -> list[str]:
             )
 
         return urls
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
 
 
 # ── Course sync ───────────────────────────────────────────────────────────────
@@ -169,7 +369,7 @@ def sync_course(course_id: int, course_url: str) -> None:
     from app.database import get_db
     from app.models import Course, Lecture
     from app import jobs
-    from echo360.course import EchoCloudCourse
+    from sqlalchemy import update
     from sqlalchemy.dialects.sqlite import insert as sqlite_insert
     from datetime import datetime, timezone
 
@@ -180,48 +380,53 @@ def sync_course(course_id: int, course_url: str) -> None:
     hostname = _extract_hostname(course_url)
     section_id = _extract_section_id(course_url)
 
-    driver = None
     try:
-        driver = _build_driver()
-        if not _load_session(driver, hostname):
-            raise RuntimeError(
-                "No saved session found. Run the CLI first to log in:\n"
-                "  python echo360.py URL --chrome --persistent-session"
-            )
-
-        course = EchoCloudCourse(section_id, hostname, alternative_feeds=False)
-        course.set_driver(driver)
-
-        course_data = course._get_course_data()
-        course_name = course.course_name
-
+        # Fast path: plain HTTP with the saved cookies, no browser or Selenium import
+        course_data = _fetch_course_data(hostname, section_id)
+        if course_data is not None:
+            course_name = _course_name_from_data(course_data, section_id)
+        else:
+            _LOGGER.info("HTTP course fetch failed for course %d, falling back to Chrome", course_id)
+            course_data, course_name = _fetch_course_data_chrome(hostname, section_id)
+
+        # Lectures are parsed lazily and upserted in bounded batches, so only
+        # one batch of encoded raw_json is alive next to course_data at a time.
+        # The first statement is an UPDATE, so SQLite takes the write lock up
+        # front (as BEGIN IMMEDIATE would) rather than upgrading a read lock.
+        count = 0
         with get_db() as session:
-            c = session.get(Course, course_id)
-            if c:
-                c.name = course_name
-                c.last_synced_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-
-        lectures = _parse_lectures(course_data)
-
-        with get_db() as session:
-            for lec in lectures:
-                stmt = sqlite_insert(Lecture).values(
-                    course_id=course_id,
-                    echo_id=lec["echo_id"],
-                    title=lec["title"],
-                    date=lec["date"],
-                    raw_json=lec["raw_json"],
-                    duration_seconds=lec.get("duration_seconds"),
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["course_id", "echo_id"],
-                    set_={
-                        "date": stmt.excluded.date,
-                        "raw_json": stmt.excluded.raw_json,
-                        "duration_seconds": stmt.excluded.duration_seconds,
-                    },
+            session.execute(
+                update(Course)
+                .where(Course.id == course_id)
+                .values(
+                    name=course_name,
+                    last_synced_at=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
                 )
-                session.execute(stmt)
+            )
+            stmt = sqlite_insert(Lecture)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["course_id", "echo_id"],
+                set_={
+                    "date": stmt.excluded.date,
+                    "raw_json": stmt.excluded.raw_json,
+                    "duration_seconds": stmt.excluded.duration_seconds,
+                },
+            )
+            parsed = _parse_lectures(course_data)
+            while batch := list(itertools.islice(parsed, _UPSERT_BATCH)):
+                # One executemany per batch instead of a statement per row
+                session.execute(stmt, [
+                    {
+                        "course_id": course_id,
+                        "echo_id": lec["echo_id"],
+                        "title": lec["title"],
+                        "date": lec["date"],
+                        "raw_json": lec["raw_json"],
+                        "duration_seconds": lec.get("duration_seconds"),
+                    }
+                    for lec in batch
+                ])
+                count += len(batch)
 
             # Reset no_media lectures whose raw_json now indicates media may be available
             no_media_lectures = (
@@ -231,7 +436,7 @@ def sync_course(course_id: int, course_url: str) -> None:
             )
             for lec in no_media_lectures:
                 try:
-                    data = json.loads(lec.raw_json)
+                    data = orjson.loads(lec.raw_json)
                     lesson = data.get("lesson", data)
                     has_content = lesson.get("hasContent", False)
                     has_media = bool(lesson.get("medias"))
@@ -242,61 +447,117 @@ def sync_course(course_id: int, course_url: str) -> None:
                     if has_content or has_media or (is_past and has_video):
                         lec.audio_status = "pending"
                         lec.error_message = None
-                except (json.JSONDecodeError, TypeError):
+                except (orjson.JSONDecodeError, TypeError):
                     pass
 
-        _bcast({"type": "sync_done", "course_name": course_name, "count": len(lectures)})
+        _bcast({"type": "sync_done", "course_name": course_name, "count": count})
 
     except Exception as e:
         _LOGGER.exception("sync_course failed for course %d", course_id)
         _bcast({"type": "sync_error", "error": str(e)})
         raise
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
 
 
-def _parse_lectures(course_data: dict) -> list[dict]:
-    results = []
+def _fetch_course_data(hostname: str, section_id: str) -> dict | None:
+    """Fetch the section syllabus JSON over HTTP with the saved cookies.
+
+    Returns None when the cookies are missing or rejected, so the caller can
+    fall back to a full Chrome session. A 401 is retried only if cookies.json
+    changed since the session was built; resending the same cookies would get
+    the same answer.
+    """
+    import requests as req
+
+    if not os.path.exists(_COOKIES_FILE):
+        return None
+    url = f"{hostname}/section/{section_id}/syllabus"
+    try:
+        r = _get_session().get(url, headers={"Accept": "application/json"}, timeout=30)
+        if r.status_code == 401:
+            if _cookies_mtime() == _SESSION_TLS.mtime:
+                return None
+            r = _get_session().get(url, headers={"Accept": "application/json"}, timeout=30)
+    except req.RequestException:
+        _LOGGER.debug("HTTP course fetch raised", exc_info=True)
+        return None
+    body = r.content.strip()
+    if not r.ok or not body.startswith(b"{"):
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _fetch_course_data_chrome(hostname: str, section_id: str) -> tuple[dict, str]:
+    """Fetch course data through a headless Chrome session (slow fallback)."""
+    from echo360.course import EchoCloudCourse
+
+    with _pool.acquire(hostname, block_assets=True) as driver:
+        course = EchoCloudCourse(section_id, hostname, alternative_feeds=False)
+        course.set_driver(driver)
+        return course._get_course_data(), course.course_name
+
+
+def _course_name_from_data(course_data: dict, fallback: str) -> str:
+    """Pick the course name out of course data, as EchoCloudCourse.course_name does."""
+    candidate_paths = [
+        lambda v: v["lesson"]["video"]["published"]["courseName"],
+        lambda v: v["lesson"]["lesson"]["displayName"],
+        lambda v: v["lesson"]["lesson"]["section"]["sectionName"],
+    ]
     for v in course_data.get("data", []):
-        try:
-            if "lessons" in v:
-                group_name = v.get("groupInfo", {}).get("name", "")
-                for sub in v["lessons"]:
-                    lec = _parse_single(sub, group_prefix=group_name)
-                    if lec:
-                        results.append(lec)
+        for path in candidate_paths:
+            try:
+                name = path(v)
+            except (KeyError, TypeError):
+                continue
+            if name:
+                return name
+    return fallback
+
+
+def _parse_lectures(course_data: dict) -> Iterator[dict]:
+    # Flatten grouped lessons into (lesson, group prefix) pairs and parse them
+    # one at a time. JSON encoding holds the GIL, so a thread pool would not help.
+    def _items():
+        for v in course_data.get("data", ()):
+            if not isinstance(v, dict):
+                continue
+            lessons = v.get("lessons")
+            if lessons is not None:
+                prefix = (v.get("groupInfo") or {}).get("name", "")
+                for sub in lessons:
+                    yield sub, prefix
             else:
-                lec = _parse_single(v)
-                if lec:
-                    results.append(lec)
-        except (KeyError, TypeError):
-            continue
-    return results
+                yield v, ""
+
+    return (lec for v, p in _items() if (lec := _parse_single(v, p)) is not None)
 
 
 def _parse_single(v: dict, group_prefix: str = "") -> dict | None:
-    try:
-        lesson = v["lesson"]["lesson"]
-        echo_id = str(lesson["id"])
-        title = lesson.get("name", "Untitled")
-        if group_prefix:
-            title = f"{group_prefix} - {title}"
+    # Plain lookups so malformed entries are skipped without raising
+    outer = v.get("lesson") if isinstance(v, dict) else None
+    lesson = outer.get("lesson") if isinstance(outer, dict) else None
+    if not isinstance(lesson, dict) or lesson.get("id") is None:
+        return None
 
-        date = "1970-01-01"
-        if v["lesson"].get("startTimeUTC"):
-            date = v["lesson"]["startTimeUTC"][:10]
-        elif lesson.get("createdAt"):
-            date = lesson["createdAt"][:10]
+    echo_id = str(lesson["id"])
+    title = lesson.get("name", "Untitled")
+    if group_prefix:
+        title = f"{group_prefix} - {title}"
 
-        duration_seconds = _compute_duration(v)
+    # Non-string timestamps fall through to the default rather than raising
+    # and aborting the whole sync
+    date = "1970-01-01"
+    if isinstance(start := outer.get("startTimeUTC"), str) and start:
+        date = start[:10]
+    elif isinstance(created := lesson.get("createdAt"), str) and created:
+        date = created[:10]
 
-        return {"echo_id": echo_id, "title": title, "date": date, "raw_json": json.dumps(v), "duration_seconds": duration_seconds}
-    except (KeyError, TypeError):
-        return None
+    duration_seconds = _compute_duration(v)
+
+    return {"echo_id": echo_id, "title": title, "date": date, "raw_json": orjson.dumps(v).decode(), "duration_seconds": duration_seconds}
 
 
 def _compute_duration(v: dict) -> int | None:
@@ -355,7 +616,6 @@ def _extract_stream_url(video_json: dict, hostname: str):
         m3u8urls = [m["uri"] for m in manifests if m.get("uri")]
         if not m3u8urls:
             return None
-        from urllib.parse import urlparse
         netloc = urlparse(hostname).netloc
         fixed = []
         for u in m3u8urls:
@@ -371,10 +631,40 @@ def _extract_stream_url(video_json: dict, hostname: str):
 def _build_session_from_cookies() -> "requests.Session":
     """Build a requests.Session loaded with saved Echo360 cookies."""
     import requests as req
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
     session = req.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     if os.path.exists(_COOKIES_FILE):
         with open(_COOKIES_FILE) as f:
             cookies = json.load(f)
         for c in cookies:
             session.cookies.set(c["name"], c["value"])
     return session
+
+
+def _get_session() -> "requests.Session":
+    """Return this thread's cookie-loaded session, reusing its keep-alive connections."""
+    mtime = _cookies_mtime()
+    session = getattr(_SESSION_TLS, "session", None)
+    if session is None or _SESSION_TLS.mtime != mtime:
+        _reset_session()
+        session = _build_session_from_cookies()
+        _SESSION_TLS.session = session
+        _SESSION_TLS.mtime = mtime
+    return session
+
+
+def _reset_session() -> None:
+    """Close and drop this thread's cached session."""
+    session = getattr(_SESSION_TLS, "session", None)
+    if session is not None:
+        session.close()
+    _SESSION_TLS.session = None
@@ -2,6 +2,8 @@
 import json
 import logging
 
+import orjson
+
 from app.database import get_db
 from app.llm import router
 from app.models import Course, Lecture
@@ -145,16 +147,17 @@ async def clean_titles(course_id: int) -> None:
 
 
 def _parse_response(raw: str) -> dict:
-    """Parse the LLM JSON response."""
-    text = raw.strip()
-    if text.startswith("```"):
-        first_newline = text.index("\n")
-        text = text[first_newline + 1:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-    data = json.loads(text)
+    """Parse the LLM JSON response.
+
+    Takes the outermost {...} span, which also drops any markdown fences or
+    chatter the model wrapped around the object.
+    """
+    start = raw.find("{")
+    end = raw.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("No JSON object in response")
+
+    data = orjson.loads(raw[start:end + 1])
     if "course_name" not in data or "lectures" not in data:
         raise ValueError("Missing required fields in response")
     return data
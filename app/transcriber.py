@@ -1,11 +1,20 @@
 """Async transcription — local faster-whisper or remote Groq API."""
 import asyncio
-import json
+import collections
+import csv
 import logging
 import os
+import random
+import shutil
 import sys
+import tempfile
+import time
+from functools import lru_cache
+from typing import AsyncIterator
 
 import httpx
+import orjson
+from sqlalchemy import insert, update
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -14,13 +23,38 @@ from tenacity import (
 )
 
 from app.database import get_db
-from app.models import Lecture, Transcript
+from app.models import Lecture, Transcript, TranscriptSegment
 from app import jobs
+from app.transcribe_worker import ERROR, FRAME_HEADER, JOB_END
 
 _LOGGER = logging.getLogger(__name__)
 
 GROQ_API_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
 GROQ_MAX_FILE_SIZE = 25 * 1024 * 1024  # 25 MB
+GROQ_MAX_ATTEMPTS = 20
+GROQ_CHUNK_CONCURRENCY = 4  # chunks of one lecture in flight at once
+# Requests in flight per backend across all lectures, so a burst of queued
+# lectures (or chunks of one long lecture) can't trip Groq's rate limits or
+# swamp the Modal deployment
+GROQ_MAX_CONCURRENCY = int(os.environ.get("GROQ_MAX_CONCURRENCY", "4"))
+MODAL_MAX_CONCURRENCY = int(os.environ.get("MODAL_MAX_CONCURRENCY", "8"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+PRELOAD_MAX_SIZE = 32 * 1024 * 1024  # uploads below this are read into memory once
+# Cloud mode: send to Groq and Modal at once instead of Modal only after Groq fails
+CLOUD_RACE = os.environ.get("CLOUD_RACE", "0") == "1"
+
+# One random boundary for every upload; 128 bits won't collide with audio data
+_BOUNDARY = os.urandom(16).hex()
+_MULTIPART_CONTENT_TYPE = f"multipart/form-data; boundary={_BOUNDARY}"
+_MULTIPART_TAIL = f"\r\n--{_BOUNDARY}--\r\n".encode()
+
+# Minimum gap between progress broadcasts for one lecture
+_BROADCAST_INTERVAL = 0.5  # seconds
+
+_groq_sem = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+_modal_sem = asyncio.Semaphore(MODAL_MAX_CONCURRENCY)
+_local_worker: "_LocalWorker | None" = None
+_http_clients: dict[str, httpx.AsyncClient] = {}
 
 
 class _RetryableAPIError(Exception):
@@ -32,14 +66,21 @@ class _RetryableAPIError(Exception):
         super().__init__(f"API error ({status_code}): {text[:200]}")
 
 
-def _groq_wait(retry_state) -> float:
-    """Custom wait: respect Retry-After on 429, exponential backoff on 5xx."""
-    exc = retry_state.outcome.exception()
-    if isinstance(exc, _RetryableAPIError):
-        if exc.status_code == 429:
-            return (int(exc.retry_after) + 5) if exc.retry_after else 60
-        return min(2 ** (retry_state.attempt_number - 1) * 5, 120)
-    return 5
+def _groq_backoff(exc: _RetryableAPIError, attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After on 429, exponential backoff
+    on 5xx. Jittered so concurrent chunks don't retry in lockstep."""
+    if exc.status_code == 429:
+        delay = exc.retry_after + 2 if exc.retry_after is not None else 60
+    else:
+        delay = min(2 ** (attempt - 1) * 5, 120)
+    return delay + random.uniform(0, 1)
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    try:
+        return float(resp.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
 
 
 def _modal_wait(retry_state) -> float:
@@ -47,6 +88,58 @@ def _modal_wait(retry_state) -> float:
     return min(2 ** (retry_state.attempt_number - 1) * 10, 80)
 
 
+class _ThrottledBroadcaster:
+    """Wraps a lecture's _bcast so progress updates go out at most every
+    min_interval seconds.
+
+    Payloads without "progress" (status changes) are sent at once and discard
+    any held-back progress. A progress update arriving inside the window is
+    held, and only the latest one is sent when the window ends. close() drops
+    held-back and later progress, so nothing lands after the job's terminal
+    event.
+    """
+
+    def __init__(self, bcast, min_interval: float = _BROADCAST_INTERVAL):
+        self._bcast = bcast
+        self._min_interval = min_interval
+        self._last = 0.0
+        self._pending: dict | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._closed = False
+
+    def __call__(self, data: dict) -> None:
+        if "progress" not in data:
+            self._cancel()
+            self._bcast(data)
+            return
+        if self._closed:
+            return
+        self._pending = data
+        if self._timer is None:
+            delay = self._last + self._min_interval - time.monotonic()
+            if delay <= 0:
+                self._flush()
+            else:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._flush)
+
+    def _flush(self) -> None:
+        self._timer = None
+        if self._pending is not None:
+            self._last = time.monotonic()
+            data, self._pending = self._pending, None
+            self._bcast(data)
+
+    def _cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = None
+
+    def close(self) -> None:
+        self._closed = True
+        self._cancel()
+
+
 def _parse_segments(data: dict) -> list[dict]:
     """Extract segment list from a Whisper API response."""
     return [
@@ -55,7 +148,89 @@ def _parse_segments(data: dict) -> list[dict]:
     ]
 
 
+def _http_client(name: str, **kwargs) -> httpx.AsyncClient:
+    """Shared keep-alive HTTP/2 client per upstream, created on first use.
+
+    Reusing one client per host skips the TCP + TLS handshake on every chunk
+    and retry, and lets concurrent chunk uploads share a connection.
+    """
+    client = _http_clients.get(name)
+    if client is None or client.is_closed:
+        client = _http_clients[name] = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            **kwargs,
+        )
+    return client
+
+
+@lru_cache(maxsize=8)
+def _form_preamble(fields: tuple[tuple[str, str], ...]) -> bytes:
+    """Multipart framing for the fixed form fields, built once per field set."""
+    return b"".join(
+        f'--{_BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields
+    )
+
+
+class _FileBody:
+    """Re-iterable multipart body for files too large to preload.
+
+    Each iteration reopens the file, so the same object can be passed as
+    content= on every retry. httpx only refuses to replay generator streams.
+    """
+
+    def __init__(self, head: bytes, path: str):
+        self._head = head
+        self._path = path
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._head
+        f = await jobs.run_io(open, self._path, "rb")
+        try:
+            while chunk := await jobs.run_io(f.read, UPLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            f.close()
+        yield _MULTIPART_TAIL
+
+
+async def _multipart_upload(audio_path: str, fields: tuple[tuple[str, str], ...] = ()) -> tuple[dict, bytes | _FileBody]:
+    """Prepare a multipart/form-data upload of audio_path as "file".
+
+    Returns the request headers, with an exact Content-Length, and the body.
+    The body is reused unchanged for every attempt. Files under
+    PRELOAD_MAX_SIZE (every Groq chunk) are read once into a single buffer, so
+    retries resend the same bytes without going back to disk. Larger files
+    stream from disk in UPLOAD_CHUNK_SIZE pieces, read off the event loop. Only
+    the file part header varies between uploads; the boundary, field framing
+    and trailer are shared.
+    """
+    filename = os.path.basename(audio_path).replace('"', "%22")
+    head = _form_preamble(fields) + (
+        f'--{_BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: audio/ogg\r\n\r\n"
+    ).encode()
+    size = await jobs.run_io(os.path.getsize, audio_path)
+    headers = {
+        "Content-Type": _MULTIPART_CONTENT_TYPE,
+        "Content-Length": str(len(head) + size + len(_MULTIPART_TAIL)),
+    }
+
+    if size < PRELOAD_MAX_SIZE:
+        data = await jobs.run_io(_read_bytes, audio_path)
+        return headers, b"".join((head, data, _MULTIPART_TAIL))
+    return headers, _FileBody(head, audio_path)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
 async def transcribe_lecture(lecture_id: int, model_name: str = "groq") -> None:
+    # Look the lecture up and mark it transcribing in one transaction; the
+    # status commits before the long upload so the UI sees it straight away
     with get_db() as session:
         lec = session.get(Lecture, lecture_id)
         if not lec:
@@ -65,16 +240,15 @@ async def transcribe_lecture(lecture_id: int, model_name: str = "groq") -> None:
         course_id = lec.course_id
         audio_path = lec.audio_path
         duration_seconds = lec.duration_seconds
+        lec.transcript_status = "transcribing"
+        lec.error_message = None
 
-    def _bcast(data: dict):
+    def _send(data: dict):
         jobs.broadcast({"type": "lecture_update", "lecture_id": lecture_id, "course_id": course_id, **data})
 
+    _bcast = _ThrottledBroadcaster(_send)
+
     try:
-        with get_db() as session:
-            lec = session.get(Lecture, lecture_id)
-            if lec:
-                lec.transcript_status = "transcribing"
-                lec.error_message = None
         jobs.broadcast({"type": "transcription_start", "lecture_id": lecture_id})
         _bcast({"status": "transcribing"})
 
@@ -85,19 +259,25 @@ async def transcribe_lecture(lecture_id: int, model_name: str = "groq") -> None:
         elif model_name.startswith("modal"):
             segments = await _transcribe_modal(audio_path, _bcast)
         else:
-            segments = await _transcribe_local(audio_path, model_name)
+            segments = await _transcribe_local(audio_path, model_name, _bcast, duration_seconds)
 
+        # Transcript row and "done" status commit together
         with get_db() as session:
-            session.add(Transcript(
-                lecture_id=lecture_id,
-                model=model_name,
-                segments=json.dumps(segments),
-            ))
-            lec = session.get(Lecture, lecture_id)
-            if lec:
-                lec.transcript_status = "done"
-                lec.transcript_model = model_name
+            transcript = Transcript(lecture_id=lecture_id, model=model_name)
+            session.add(transcript)
+            session.flush()
+            if segments:
+                session.execute(insert(TranscriptSegment), [
+                    {"transcript_id": transcript.id, "start": seg["start"], "end": seg["end"], "text": seg["text"]}
+                    for seg in segments
+                ])
+            session.execute(
+                update(Lecture)
+                .where(Lecture.id == lecture_id)
+                .values(transcript_status="done", transcript_model=model_name)
+            )
 
+        _bcast.close()
         jobs.broadcast({"type": "transcription_done", "lecture_id": lecture_id})
 
         from app.outline_sync import sync_lecture_to_outline
@@ -105,30 +285,78 @@ async def transcribe_lecture(lecture_id: int, model_name: str = "groq") -> None:
 
     except Exception as e:
         _LOGGER.exception("Transcription failed for lecture %d", lecture_id)
+        _bcast.close()
         with get_db() as session:
-            lec = session.get(Lecture, lecture_id)
-            if lec:
-                lec.transcript_status = "error"
-                lec.error_message = str(e)[:500]
+            session.execute(
+                update(Lecture)
+                .where(Lecture.id == lecture_id)
+                .values(transcript_status="error", error_message=str(e)[:500])
+            )
         jobs.broadcast(
             {"type": "transcription_error", "lecture_id": lecture_id, "error": str(e)}
         )
+    finally:
+        # Also covers cancellation, which skips both paths above
+        _bcast.close()
 
 
-async def _split_audio(audio_path: str, max_size: int = GROQ_MAX_FILE_SIZE) -> list[str]:
-    """Split audio into chunks that stay under max_size bytes. Returns list of chunk file paths."""
-    import tempfile
+async def _probe_duration(path: str) -> float:
+    """Container duration in seconds.
 
-    # Calculate chunk duration based on file size and total duration
-    file_size = os.path.getsize(audio_path)
-    # Get total duration via ffprobe
+    Read in-process with PyAV (a faster-whisper dependency), which skips an
+    ffprobe fork/exec; falls back to ffprobe if PyAV is unavailable.
+    """
+    try:
+        return await jobs.run_io(_av_duration, path)
+    except ImportError:
+        return await _ffprobe_duration(path)
+
+
+def _av_duration(path: str) -> float:
+    import av
+
+    with av.open(path) as container:
+        if container.duration is not None:
+            return container.duration / av.time_base
+        stream = container.streams.audio[0]
+        return float(stream.duration * stream.time_base)
+
+
+async def _ffprobe_duration(path: str) -> float:
     probe = await asyncio.create_subprocess_exec(
         "ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1", audio_path,
+        "-of", "default=noprint_wrappers=1:nokey=1", path,
         stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
     )
     stdout, _ = await probe.communicate()
-    total_duration = float(stdout.decode().strip())
+    return float(stdout.decode().strip())
+
+
+def _make_chunk_dir(file_size: int) -> str:
+    return tempfile.mkdtemp(prefix="groq_chunks_", dir=_ram_tmpdir(file_size))
+
+
+def _ram_tmpdir(needed_bytes: int) -> str | None:
+    """Return /dev/shm if it has room for needed_bytes, else None (default temp dir).
+
+    Docker's default /dev/shm is only 64 MB, hence the free-space check.
+    """
+    try:
+        free = shutil.disk_usage("/dev/shm").free
+    except OSError:
+        return None
+    return "/dev/shm" if free > needed_bytes * 2 else None
+
+
+async def _split_audio(audio_path: str, max_size: int = GROQ_MAX_FILE_SIZE) -> list[tuple[str, float, float]]:
+    """Split audio into chunks that stay under max_size bytes.
+
+    Returns (chunk path, start, end) per chunk in order, with times in seconds,
+    from the segment list ffmpeg prints while splitting.
+    """
+    # Calculate chunk duration based on file size and total duration
+    file_size = await jobs.run_io(os.path.getsize, audio_path)
+    total_duration = await _probe_duration(audio_path)
 
     # Target 20 MB per chunk (leave headroom below the 25 MB limit)
     target_chunk_size = 20 * 1024 * 1024
@@ -138,27 +366,33 @@ async def _split_audio(audio_path: str, max_size: int = GROQ_MAX_FILE_SIZE) -> l
 
     _LOGGER.info("Splitting %.0fs audio into ~%ds chunks (%.0f KB/s bitrate)", total_duration, chunk_seconds, bytes_per_second / 1024)
 
-    chunk_dir = tempfile.mkdtemp(prefix="groq_chunks_")
+    chunk_dir = await jobs.run_io(_make_chunk_dir, file_size)
     chunk_pattern = os.path.join(chunk_dir, "chunk_%03d.ogg")
 
     proc = await asyncio.create_subprocess_exec(
         "ffmpeg", "-i", audio_path,
         "-f", "segment", "-segment_time", str(chunk_seconds),
+        # "path,start,end" per chunk on stdout, in output order
+        "-segment_list", "pipe:1", "-segment_list_type", "csv",
+        "-segment_list_entry_prefix", chunk_dir + os.sep,
         "-c", "copy", "-vn",
         chunk_pattern,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
-    _, stderr = await proc.communicate()
+    stdout, stderr = await proc.communicate()
     if proc.returncode != 0:
+        await jobs.run_io(shutil.rmtree, chunk_dir, ignore_errors=True)
         raise RuntimeError(f"ffmpeg split failed: {stderr.decode()[:500]}")
 
-    chunks = sorted(
-        os.path.join(chunk_dir, f) for f in os.listdir(chunk_dir) if f.startswith("chunk_")
-    )
-    if not chunks:
+    segments = [
+        (path, float(start), float(end))
+        for path, start, end in csv.reader(stdout.decode().splitlines())
+    ]
+    if not segments:
+        await jobs.run_io(shutil.rmtree, chunk_dir, ignore_errors=True)
         raise RuntimeError("ffmpeg produced no chunks")
-    return chunks
+    return segments
 
 
 async def _transcribe_groq(audio_path: str, model_name: str, _bcast) -> list[dict]:
@@ -172,79 +406,105 @@ async def _transcribe_groq(audio_path: str, model_name: str, _bcast) -> list[dic
     if ":" in model_name:
         groq_model = model_name.split(":", 1)[1]
 
-    file_size = os.path.getsize(audio_path)
+    file_size = await jobs.run_io(os.path.getsize, audio_path)
     needs_chunking = file_size > GROQ_MAX_FILE_SIZE
 
     if needs_chunking:
         _LOGGER.info("Audio file is %.1f MB, splitting into chunks for Groq API", file_size / 1024 / 1024)
         chunks = await _split_audio(audio_path)
         try:
-            return await _transcribe_groq_chunked(chunks, groq_model, api_key)
+            return await _transcribe_groq_chunked(chunks, groq_model, api_key, _bcast)
         finally:
             # Clean up temp chunk files
-            import shutil
-            shutil.rmtree(os.path.dirname(chunks[0]), ignore_errors=True)
+            await jobs.run_io(shutil.rmtree, os.path.dirname(chunks[0][0]), ignore_errors=True)
     else:
         return await _transcribe_groq_single(audio_path, groq_model, api_key)
 
 
-@retry(
-    retry=retry_if_exception_type(_RetryableAPIError),
-    wait=_groq_wait,
-    stop=stop_after_attempt(20),
-    before_sleep=before_sleep_log(_LOGGER, logging.WARNING),
-    reraise=True,
-)
 async def _transcribe_groq_single(audio_path: str, groq_model: str, api_key: str) -> list[dict]:
-    """Transcribe a single file via Groq API with retry for transient errors."""
-    async with httpx.AsyncClient(timeout=httpx.Timeout(300.0)) as client:
-        with open(audio_path, "rb") as f:
+    """Transcribe a single file via Groq API, retrying rate limits and 5xx errors."""
+    client = _http_client("groq", timeout=httpx.Timeout(300.0))
+    # Built once and resent on every retry. Chunked uploads get here only
+    # after taking their per-lecture slot, which bounds how many are in memory
+    headers, body = await _multipart_upload(audio_path, (
+        ("model", groq_model),
+        ("response_format", "verbose_json"),
+        ("timestamp_granularities[]", "segment"),
+    ))
+    attempt = 0
+    while True:
+        attempt += 1
+        async with _groq_sem:
             resp = await client.post(
                 GROQ_API_URL,
-                headers={"Authorization": f"Bearer {api_key}"},
-                files={"file": (os.path.basename(audio_path), f, "audio/ogg")},
-                data={
-                    "model": groq_model,
-                    "response_format": "verbose_json",
-                    "timestamp_granularities[]": "segment",
-                },
+                headers={"Authorization": f"Bearer {api_key}", **headers},
+                content=body,
             )
 
-    if resp.status_code == 200:
-        return _parse_segments(resp.json())
-    if resp.status_code == 429 or resp.status_code >= 500:
-        retry_after = float(resp.headers["retry-after"]) if resp.headers.get("retry-after") else None
-        raise _RetryableAPIError(resp.status_code, retry_after, resp.text[:500])
-    raise RuntimeError(f"Groq API error ({resp.status_code}): {resp.text[:500]}")
-
+        if resp.status_code == 200:
+            return _parse_segments(orjson.loads(resp.content))
+        if resp.status_code != 429 and resp.status_code < 500:
+            raise RuntimeError(f"Groq API error ({resp.status_code}): {resp.text[:500]}")
+
+        exc = _RetryableAPIError(resp.status_code, _retry_after(resp), resp.text[:500])
+        if attempt >= GROQ_MAX_ATTEMPTS:
+            raise exc
+        delay = _groq_backoff(exc, attempt)
+        _LOGGER.warning("Groq returned %d, retrying in %.0fs (attempt %d/%d)",
+                        exc.status_code, delay, attempt, GROQ_MAX_ATTEMPTS)
+        await asyncio.sleep(delay)
+
+
+async def _transcribe_groq_chunked(chunks: list[tuple[str, float, float]], groq_model: str, api_key: str, _bcast) -> list[dict]:
+    """Transcribe (path, start, end) chunks concurrently via Groq, stitching timestamps."""
+    # Each chunk's offset is its start time relative to the first chunk, so
+    # chunks can finish in any order
+    offsets = [start - chunks[0][1] for _, start, _ in chunks]
+
+    total_seconds = chunks[-1][2] - chunks[0][1]
+    # Per-lecture bound on top of _groq_sem, so a long lecture doesn't have
+    # every chunk opening files and sitting in backoff at once
+    sem = asyncio.Semaphore(GROQ_CHUNK_CONCURRENCY)
+    completed = 0
+    done_seconds = 0.0
+
+    async def _do_chunk(chunk_path: str, start: float, end: float) -> list[dict]:
+        nonlocal completed, done_seconds
+        async with sem:
+            segments = await _transcribe_groq_single(chunk_path, groq_model, api_key)
+        completed += 1
+        done_seconds += end - start
+        _LOGGER.info("Transcribed chunk %d/%d", completed, len(chunks))
+        if jobs.has_subscribers():
+            _bcast({"status": "transcribing", "progress": {
+                "done": round(done_seconds, 1), "total": round(total_seconds, 1), "stage": "transcribe",
+            }})
+        return segments
+
+    # On the first failure the remaining uploads are cancelled and awaited, so
+    # none keep retrying (and holding _groq_sem) after the chunk directory is
+    # removed or cloud mode has moved on to Modal. Plain asyncio.wait rather
+    # than a TaskGroup so callers see the original exception, not a group.
+    tasks = [asyncio.ensure_future(_do_chunk(*chunk)) for chunk in chunks]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in tasks:
+            if task in done and task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    results = [task.result() for task in tasks]
 
-async def _transcribe_groq_chunked(chunks: list[str], groq_model: str, api_key: str) -> list[dict]:
-    """Transcribe multiple chunks sequentially via Groq, stitching timestamps."""
     all_segments = []
-    time_offset = 0.0
-
-    for i, chunk_path in enumerate(chunks):
-        _LOGGER.info("Transcribing chunk %d/%d", i + 1, len(chunks))
-        chunk_segments = await _transcribe_groq_single(chunk_path, groq_model, api_key)
-
-        # Offset timestamps by the cumulative duration of previous chunks
+    for time_offset, chunk_segments in zip(offsets, results):
         for seg in chunk_segments:
             all_segments.append({
                 "start": round(seg["start"] + time_offset, 2),
                 "end": round(seg["end"] + time_offset, 2),
                 "text": seg["text"],
             })
-
-        # Get the actual duration of this chunk via ffprobe for accurate offset
-        probe = await asyncio.create_subprocess_exec(
-            "ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1", chunk_path,
-            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await probe.communicate()
-        chunk_duration = float(stdout.decode().strip())
-        time_offset += chunk_duration
-
     return all_segments
 
 
@@ -254,7 +514,9 @@ async def _transcribe_modal(audio_path: str, _bcast) -> list[dict]:
     if not endpoint_url:
         raise RuntimeError("MODAL_WHISPER_URL environment variable is not set. Deploy modal_whisper.py first.")
 
-    return await _transcribe_modal_request(audio_path, endpoint_url)
+    # Prepared once here, outside the retried call, so retries reuse it
+    headers, body = await _multipart_upload(audio_path)
+    return await _transcribe_modal_request(endpoint_url, headers, body)
 
 
 @retry(
@@ -264,17 +526,14 @@ async def _transcribe_modal(audio_path: str, _bcast) -> list[dict]:
     before_sleep=before_sleep_log(_LOGGER, logging.WARNING),
     reraise=True,
 )
-async def _transcribe_modal_request(audio_path: str, endpoint_url: str) -> list[dict]:
+async def _transcribe_modal_request(endpoint_url: str, headers: dict, body: bytes | _FileBody) -> list[dict]:
     """Single Modal API call — retried by tenacity on transient errors."""
-    async with httpx.AsyncClient(timeout=httpx.Timeout(900.0), follow_redirects=True) as client:
-        with open(audio_path, "rb") as f:
-            resp = await client.post(
-                endpoint_url,
-                files={"file": (os.path.basename(audio_path), f, "audio/ogg")},
-            )
+    client = _http_client("modal", timeout=httpx.Timeout(900.0), follow_redirects=True)
+    async with _modal_sem:
+        resp = await client.post(endpoint_url, headers=headers, content=body)
 
     if resp.status_code == 200:
-        return _parse_segments(resp.json())
+        return _parse_segments(orjson.loads(resp.content))
     if resp.status_code == 303 or resp.status_code >= 500:
         raise _RetryableAPIError(resp.status_code, text=resp.text[:500])
     raise RuntimeError(f"Modal endpoint error ({resp.status_code}): {resp.text[:500]}")
@@ -285,6 +544,9 @@ async def _transcribe_cloud(audio_path: str, _bcast) -> list[dict]:
     groq_key = os.environ.get("GROQ_API_KEY")
     modal_url = os.environ.get("MODAL_WHISPER_URL")
 
+    if groq_key and modal_url and CLOUD_RACE:
+        return await _race_groq_modal(audio_path, _bcast)
+
     if groq_key:
         try:
             return await _transcribe_groq(audio_path, "groq", _bcast)
@@ -302,18 +564,153 @@ async def _transcribe_cloud(audio_path: str, _bcast) -> list[dict]:
     return await _transcribe_modal(audio_path, _bcast)
 
 
-async def _transcribe_local(audio_path: str, model_name: str) -> list[dict]:
-    """Transcribe locally via faster-whisper subprocess."""
-    proc = await asyncio.create_subprocess_exec(
-        sys.executable, "-m", "app.transcribe_worker",
-        audio_path, model_name,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
+async def _race_groq_modal(audio_path: str, _bcast) -> list[dict]:
+    """Run Groq and Modal side by side and return whichever succeeds first.
 
-    stdout_data, stderr_data = await proc.communicate()
-
-    if proc.returncode != 0:
-        raise RuntimeError(f"Transcription subprocess failed (rc={proc.returncode}): {stderr_data.decode()[:500]}")
-
-    return json.loads(stdout_data.decode())
+    Spends quota on both backends, but a Groq rate limit no longer delays the
+    Modal attempt until after the Groq retries give up.
+    """
+    groq_task = asyncio.ensure_future(_transcribe_groq(audio_path, "groq", _bcast))
+    modal_task = asyncio.ensure_future(_transcribe_modal(audio_path, _bcast))
+    names = {groq_task: "Groq", modal_task: "Modal"}
+    pending = {groq_task, modal_task}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    _LOGGER.info("Cloud race won by %s", names[task])
+                    return task.result()
+                _LOGGER.warning("%s failed in cloud race: %s", names[task], str(task.exception())[:200])
+        # Both failed: surface the Groq error, as the serial fallback would
+        raise groq_task.exception()
+    finally:
+        # Wait for the loser's cleanup (chunk tasks, temp dir) so its errors
+        # are retrieved here rather than logged as never retrieved
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _transcribe_local(audio_path: str, model_name: str, _bcast, duration_seconds: int | None = None) -> list[dict]:
+    """Transcribe locally via a long-lived faster-whisper worker process.
+
+    Only one worker is kept: asking for a different model stops the current
+    one once its job finishes, so two Whisper models never share RAM or VRAM.
+    """
+    global _local_worker
+    worker = _local_worker
+    if worker is None or worker.model_name != model_name:
+        old, worker = worker, _LocalWorker(model_name)
+        _local_worker = worker
+        if old is not None:
+            await old.close(wait=True)
+
+    def on_segment(seg: dict) -> None:
+        # Segments stream in order, so the latest end time is how far along we are
+        if duration_seconds and jobs.has_subscribers():
+            _bcast({"status": "transcribing", "progress": {
+                "done": round(min(seg["end"], duration_seconds), 1),
+                "total": duration_seconds,
+                "stage": "transcribe",
+            }})
+
+    return await worker.transcribe(audio_path, on_segment)
+
+
+class _LocalWorker:
+    """An app.transcribe_worker process for one model, kept alive across lectures.
+
+    Loading Whisper weights takes seconds, so the model is loaded once and
+    audio paths are fed over stdin. Jobs are serialised by a lock; if a job is
+    interrupted mid-stream the process is killed so no stale output leaks into
+    the next job.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._proc: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+        self._stderr_tail: collections.deque[str] = collections.deque(maxlen=20)
+        self._stderr_task: asyncio.Future | None = None
+
+    async def transcribe(self, audio_path: str, on_segment=None) -> list[dict]:
+        async with self._lock:
+            proc = await self._ensure_started()
+            try:
+                proc.stdin.write(audio_path.encode() + b"\n")
+                await proc.stdin.drain()
+                segments, error = [], None
+                try:
+                    while True:
+                        kind, size = FRAME_HEADER.unpack(await proc.stdout.readexactly(FRAME_HEADER.size))
+                        payload = await proc.stdout.readexactly(size)
+                        if kind == JOB_END:
+                            break
+                        if kind == ERROR:
+                            error = payload.decode(errors="replace")
+                            continue
+                        item = orjson.loads(payload)
+                        segments.append(item)
+                        if on_segment is not None:
+                            on_segment(item)
+                except asyncio.IncompleteReadError:
+                    rc = await proc.wait()
+                    stderr_tail = "\n".join(self._stderr_tail)
+                    raise RuntimeError(f"Transcription subprocess failed (rc={rc}): {stderr_tail[:500]}") from None
+            except BaseException:
+                self._kill()
+                raise
+        if error:
+            raise RuntimeError(f"Transcription failed: {error[:500]}")
+        return segments
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self._proc is None or self._proc.returncode is not None:
+            self._stderr_tail.clear()
+            self._proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "app.transcribe_worker", self.model_name,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            self._stderr_task = asyncio.ensure_future(self._drain_stderr(self._proc))
+        return self._proc
+
+    async def _drain_stderr(self, proc: asyncio.subprocess.Process) -> None:
+        # Keep the pipe drained; remember recent output for errors
+        async for line in proc.stderr:
+            self._stderr_tail.append(line.decode(errors="replace").rstrip())
+
+    def _kill(self) -> None:
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.kill()
+        self._proc = None
+
+    async def close(self, wait: bool = False) -> None:
+        """Stop the process. With wait=True, let an in-flight job finish first."""
+        if wait:
+            async with self._lock:
+                await self.close()
+            return
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+
+
+async def shutdown() -> None:
+    """Stop the idle local transcription worker and close the shared HTTP clients.
+    Called from the app lifespan."""
+    global _local_worker
+    worker, _local_worker = _local_worker, None
+    if worker is not None:
+        await worker.close()
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -130,6 +130,7 @@ function ProgressBar({ progress }: { progress: NonNullable<SSEMessage['progress'
   const colors = {
     download: { bar: 'bg-indigo-500', track: 'bg-slate-700' },
     convert: { bar: 'bg-amber-500', track: 'bg-slate-700' },
+    transcribe: { bar: 'bg-violet-500', track: 'bg-slate-700' },
   }
   const { bar, track } = colors[stage]
 
@@ -56,7 +56,7 @@ function ProgressBar({ progress }: { progress: NonNullable<SSEMessage['progress'
   const pct = Math.min(100, (progress.done / progress.total) * 100)
   const stage = progress.stage ?? 'download'
 
-  const colors = { download: 'bg-indigo-500', convert: 'bg-amber-500' }
+  const colors = { download: 'bg-indigo-500', convert: 'bg-amber-500', transcribe: 'bg-violet-500' }
 
   let label = ''
   if (stage === 'download') {
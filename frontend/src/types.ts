@@ -86,7 +86,7 @@ export interface SSEMessage {
   progress?: {
     done: number
     total: number
-    stage?: 'download' | 'convert'
+    stage?: 'download' | 'convert' | 'transcribe'
     speed_bps?: number
     eta_seconds?: number
   }
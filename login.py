@@ -30,13 +30,16 @@ def main():
 
     try:
         while True:
+            # Ask for the one cookie rather than serialising the whole jar on
+            # every poll, so a short interval stays cheap
             try:
-                cookies = driver.get_cookies()
+                found = driver.get_cookie("ECHO_JWT") is not None
             except Exception:
                 print("Browser closed before login completed.")
                 sys.exit(1)
 
-            if any("ECHO_JWT" in c.get("name", "") for c in cookies):
+            if found:
+                cookies = driver.get_cookies()
                 os.makedirs(PERSISTENT_SESSION_FOLDER, exist_ok=True)
                 with open(COOKIES_FILE, "w") as f:
                     json.dump(cookies, f)
@@ -45,7 +48,7 @@ def main():
                 print("  docker compose restart")
                 break
 
-            time.sleep(2)
+            time.sleep(0.5)
     except KeyboardInterrupt:
         print("\nCancelled.")
     finally: